@@ -1,4 +1,3 @@
-import re
 from enum import Enum
 from typing import AnyStr, Dict, Union
 
@@ -9,6 +8,21 @@ from .data import LecroyScopeData
 
 VBSValue = Union[str, int, float]
 
+_STATISTICS = {
+    'last': 'last.Result.Value',
+    'max': 'max.Result.Value',
+    'mean': 'mean.Result.Value',
+    'min': 'min.Result.Value',
+    'num': 'num.Result.Value',
+    'sdev': 'sdev.Result.Value',
+    'status': 'Out.Result.Status'
+}
+_STATISTICS_SEPARATOR = '|'
+
+# pre-encoded, as they are passed to write_raw
+_SCREENSHOT_SETUP_CMD = b'HCSU DEV, PNG, FORMAT, PORTRAIT, BCKG, WHITE, DEST, REMOTE, PORT, NET, AREA, GRIDAREAONLY'
+_SCREENSHOT_CMD = b'SCDP'
+
 
 def _escape(value: VBSValue) -> str:
     if isinstance(value, str):
@@ -85,9 +99,11 @@ class LecroyScope:
 
     def _parse_available_resources(self):
         for resource in self._read('app.ExecsNameAll').split(','):
-            if re.match(r"C\d.*", resource):
+            # resources are named by a single letter followed by their number, e.g. C1 or P2
+            prefix, number = resource[:1], resource[1:2]
+            if prefix == 'C' and number.isdecimal():
                 self.available_channels.append(resource)
-            elif re.match(r"P\d.*", resource):
+            elif prefix == 'P' and number.isdecimal():
                 self.available_parameters.append(resource)
 
     def check_source(self, source: str):
@@ -148,19 +164,19 @@ class LecroyScope:
 
     def statistics(self, parameter: str) -> Dict[str, str]:
         self.check_parameter(parameter)
-        return {
-            'last': self._read(f'app.Measure.{parameter}.last.Result.Value'),
-            'max': self._read(f'app.Measure.{parameter}.max.Result.Value'),
-            'mean': self._read(f'app.Measure.{parameter}.mean.Result.Value'),
-            'min': self._read(f'app.Measure.{parameter}.min.Result.Value'),
-            'num': self._read(f'app.Measure.{parameter}.num.Result.Value'),
-            'sdev': self._read(f'app.Measure.{parameter}.sdev.Result.Value'),
-            'status': self._read(f'app.Measure.{parameter}.Out.Result.Status')
-        }
+        # concatenate all values within a single query to save round trips to the scope
+        query = f' & "{_STATISTICS_SEPARATOR}" & '.join(
+            f'app.Measure.{parameter}.{path}' for path in _STATISTICS.values()
+        )
+        values = self._read(query).split(_STATISTICS_SEPARATOR)
+        if len(values) != len(_STATISTICS):
+            # unexpected response (e.g. an error or a value containing the separator), query each value on its own
+            values = [self._read(f'app.Measure.{parameter}.{path}') for path in _STATISTICS.values()]
+        return dict(zip(_STATISTICS, values))
 
     def _screenshot_raw(self) -> bytes:
-        self.scope.write("HCSU DEV, PNG, FORMAT, PORTRAIT, BCKG, WHITE, DEST, REMOTE, PORT, NET, AREA, GRIDAREAONLY")
-        self.scope.write("SCDP")
+        self.scope.write_raw(_SCREENSHOT_SETUP_CMD)
+        self.scope.write_raw(_SCREENSHOT_CMD)
         return self.scope.read_raw()
 
     def save_screenshot(self, file_path: AnyStr):
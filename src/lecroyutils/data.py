@@ -1,10 +1,85 @@
-import sys
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import AnyStr
+from numbers import Integral
+from typing import AnyStr, Dict, Iterable, List, Union
 from warnings import warn
 
 import numpy as np
 
+_S_U2_LE = struct.Struct('<H')
+
+_ENDIANNESS = (">", "<")
+_RECORD_TYPES = ("single_sweep", "interleaved", "histogram", "graph", "filter_coefficient", "complex", "extrema",
+                 "sequence_obsolete", "centered_RIS", "peak_detect")
+_PROCESSING = ("No Processing", "FIR Filter", "interpolated", "sparsed", "autoscaled", "no_results", "rolling",
+               "cumulative")
+_COUPLING = ("DC50", "GND", "DC1M", "GND", "AC1M")
+_BANDWIDTH_LIMIT = ("off", "on")
+_SOURCE = ("C1", "C2", "C3", "C4", "ND")
+_SCALE_VALUES = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# name, format and offset of the parsed WAVEDESC fields
+_WAVEDESC_FIELDS = (
+    ('template_name', 'S16', 16),
+    ('comm_type', 'u2', 32),
+    ('comm_order', 'u2', 34),
+    ('len_wavedesc', 'i4', 36),
+    ('len_usertext', 'i4', 40),
+    ('len_triggertime_array', 'i4', 48),
+    ('len_wave_array_1', 'i4', 60),
+    ('instrument_name', 'S16', 76),
+    ('instrument_number', 'i4', 92),
+    ('count_wave_array', 'i4', 116),
+    ('subarray_count', 'i4', 144),
+    ('vertical_gain', 'f4', 156),
+    ('vertical_offset', 'f4', 160),
+    ('max_value', 'f4', 164),
+    ('min_value', 'f4', 168),
+    ('nominal_bits', 'u2', 172),
+    ('horizontal_interval', 'f4', 176),
+    ('horizontal_offset', 'f8', 180),
+    ('vertical_unit', 'S48', 196),
+    ('horizontal_unit', 'S48', 244),
+    ('trigger_second', 'f8', 296),
+    ('trigger_minute', 'u1', 304),
+    ('trigger_hour', 'u1', 305),
+    ('trigger_day', 'u1', 306),
+    ('trigger_month', 'u1', 307),
+    ('trigger_year', 'i2', 308),
+    ('record_type', 'u2', 316),
+    ('processing_done', 'u2', 318),
+    ('timebase', 'u2', 324),
+    ('vertical_coupling', 'u2', 326),
+    ('fixed_vert_gain', 'u2', 332),
+    ('bandwidth_limit', 'u2', 334),
+    ('wave_source', 'u2', 344),
+)
+
+
+def _wavedesc_dtype(endianness: str) -> np.dtype:
+    names, formats, offsets = zip(*_WAVEDESC_FIELDS)
+    return np.dtype({
+        'names': names,
+        'formats': [endianness + f for f in formats],
+        'offsets': offsets,
+        'itemsize': 346
+    })
+
+
+_WAVEDESC_DT_LE = _wavedesc_dtype('<')
+_WAVEDESC_DT_BE = _wavedesc_dtype('>')
+
+
+def _parse_wavedesc(data, pos: int, little_endian: bool) -> Dict[str, Union[int, float, bytes]]:
+    dtype = _WAVEDESC_DT_LE if little_endian else _WAVEDESC_DT_BE
+    # item() converts all fields to python scalars within a single call
+    return dict(zip(dtype.names, np.frombuffer(data, dtype=dtype, count=1, offset=pos)[0].item()))
+
+
+def _decode_string(value: bytes) -> str:
+    return value.rstrip(b'\x00').decode('ascii', 'replace')
+
 
 class DataCorruptException(Exception):
     """
@@ -37,6 +112,26 @@ class LecroyScopeData(object):
         with open(filepath, 'rb') as file:
             return LecroyScopeData(file.read(), *kargs, source_desc=filepath, **kwargs)
 
+    @staticmethod
+    def parse_files(filepaths: Iterable[str], *kargs, max_workers: int = None,
+                    **kwargs) -> List['LecroyScopeData']:
+        """
+        Reads and parses the provided files concurrently using a thread pool.
+
+        See `LecroyScopeData.parse_file`, which is called for every file. Threads only overlap reading
+        the files and the NumPy passes over the samples, the header parsing holds the GIL. For many
+        small files a plain loop over `LecroyScopeData.parse_file` can therefore be faster.
+
+        :param filepaths: files to read
+        :param kargs: arguments are directly passed to `LecroyScopeData.__init__`
+        :param max_workers: maximum number of threads, defaults to the `ThreadPoolExecutor` default
+        :param kwargs: arguments are directly passed to `LecroyScopeData.__init__`
+        :return: list of `LecroyScopeData` instances in the order of `filepaths`
+        """
+        with ThreadPoolExecutor(max_workers) as executor:
+            return list(executor.map(lambda filepath: LecroyScopeData.parse_file(filepath, *kargs, **kwargs),
+                                     filepaths))
+
     def __init__(self, data: AnyStr, sparse: int = None, source_desc: str = '') -> None:
         """
         Parse the provided `data` as waveform data from a lecroy oscilloscope.
@@ -45,167 +140,183 @@ class LecroyScopeData(object):
         :param sparse: if set the waveform data is sparse decoded
         :param source_desc: can be used to track the origin of the provided data
         """
+        if sparse is not None and (not isinstance(sparse, Integral) or sparse < 1):
+            raise ValueError(f'sparse must be a positive integer, got {sparse!r}')
+
         self.data = data
+        # memoryview keeps all slices below zero-copy
+        view = memoryview(data)
         self.source_desc = source_desc
 
         self.endianness = "<"
 
         try:
-            # convert the first 50 bytes to a string to find position of substring WAVEDESC
-            self._pos_wavedesc = self.data[:50].decode("ascii", "replace").index("WAVEDESC")
+            # search the first 50 bytes for the position of WAVEDESC
+            self._pos_wavedesc = bytes(view[:50]).find(b"WAVEDESC")
+            if self._pos_wavedesc < 0:
+                raise DataCorruptException(f'Data corrupt: {self.source_desc}')
 
-            self._comm_order = self._parse_int16(34)  # big endian (>) if 0, else little
-            self.endianness = [">", "<"][self._comm_order]
+            # comm_order is either 0 or 1, therefore it can be read regardless of the byte order
+            self._comm_order = _S_U2_LE.unpack_from(view, self._pos_wavedesc + 34)[0]
+            self.endianness = _ENDIANNESS[self._comm_order]  # big endian (>) if 0, else little
 
-            self.template_name = self._parse_string(16)
-            self._comm_type = self._parse_int16(32)  # encodes whether data is stored as 8 or 16bit
+            header = _parse_wavedesc(view, self._pos_wavedesc, self.endianness == "<")
 
-            self._len_wavedesc = self._parse_int32(36)
-            self._len_usertext = self._parse_int32(40)
-            self._len_triggertime_array = self._parse_int32(48)
-            self._len_wave_array_1 = self._parse_int32(60)
+            self.template_name = _decode_string(header['template_name'])
+            self._comm_type = header['comm_type']  # encodes whether data is stored as 8 or 16bit
 
-            self.instrument_name = self._parse_string(76)
-            self.instrument_number = self._parse_int32(92)
+            self._len_wavedesc = header['len_wavedesc']
+            self._len_usertext = header['len_usertext']
+            self._len_triggertime_array = header['len_triggertime_array']
+            self._len_wave_array_1 = header['len_wave_array_1']
+
+            self.instrument_name = _decode_string(header['instrument_name'])
+            self.instrument_number = header['instrument_number']
 
             # self.traceLabel = "NOT PARSED"  # 96
-            self.count_wave_array = self._parse_int32(116)
-            self.subarray_count = self._parse_int32(144)
+            self.count_wave_array = header['count_wave_array']
+            self.subarray_count = header['subarray_count']
 
-            self.vertical_gain = self._parse_float(156)
-            self.vertical_offset = self._parse_float(160)
-            self.y_max = self.vertical_gain * self._parse_float(164) - self.vertical_offset
-            self.y_min = self.vertical_gain * self._parse_float(168) - self.vertical_offset
+            self.vertical_gain = header['vertical_gain']
+            self.vertical_offset = header['vertical_offset']
+            self.y_max = self.vertical_gain * header['max_value'] - self.vertical_offset
+            self.y_min = self.vertical_gain * header['min_value'] - self.vertical_offset
 
-            self.nominal_bits = self._parse_int16(172)
+            self.nominal_bits = header['nominal_bits']
 
-            self.horizontal_interval = self._parse_float(176)
-            self.horizontal_offset = self._parse_double(180)
+            self.horizontal_interval = header['horizontal_interval']
+            self.horizontal_offset = header['horizontal_offset']
 
-            self.y_unit = self._parse_string(196, 48)
-            self.x_unit = self._parse_string(244, 48)
+            self.y_unit = _decode_string(header['vertical_unit'])
+            self.x_unit = _decode_string(header['horizontal_unit'])
 
-            self.trigger_time = self._parse_timestamp(296)
-            self.record_type = ["single_sweep", "interleaved", "histogram", "graph",
-                                "filter_coefficient", "complex", "extrema", "sequence_obsolete",
-                                "centered_RIS", "peak_detect"][self._parse_int16(316)]
-            self.processing_done = ["No Processing", "FIR Filter", "interpolated", "sparsed",
-                                    "autoscaled", "no_results", "rolling", "cumulative"][self._parse_int16(318)]
-            self.timebase = self._parse_timebase(324)
+            self.trigger_time = self._parse_timestamp(header)
+            self.record_type = _RECORD_TYPES[header['record_type']]
+            self.processing_done = _PROCESSING[header['processing_done']]
+            self.timebase = self._parse_timebase(header['timebase'])
 
             self.Ts = self.horizontal_interval
-            self.fs = 1 / self.horizontal_interval
+            # computed in float32 like the stored interval, a zero interval results in inf
+            self.fs = 1 / np.float32(self.horizontal_interval)
 
-            self.vertical_coupling = ["DC50", "GND", "DC1M", "GND", "AC1M"][self._parse_int16(326)]
-            self.fixed_vert_gain = self._parse_fixed_vert_gain(332)
-            self.bandwidth_limit = ["off", "on"][self._parse_int16(334)]
-            self.wave_source = ["C1", "C2", "C3", "C4", "ND"][self._parse_int16(344)]
+            self.vertical_coupling = _COUPLING[header['vertical_coupling']]
+            self.fixed_vert_gain = self._parse_fixed_vert_gain(header['fixed_vert_gain'])
+            self.bandwidth_limit = _BANDWIDTH_LIMIT[header['bandwidth_limit']]
+            self.wave_source = _SOURCE[header['wave_source']]
 
             start = self._pos_wavedesc + self._len_wavedesc + self._len_usertext + self._len_triggertime_array
             type_identifier = self.endianness + ("i1" if self._comm_type == 0 else "i2")
-            self.y = np.frombuffer(self.data[start:start + self._len_wave_array_1],
-                                   dtype=np.dtype((type_identifier, self.count_wave_array)), count=1)[0]
-            self.x = np.linspace(
-                0, self.count_wave_array * self.horizontal_interval, num=self.count_wave_array
-            ) + self.horizontal_offset
+            raw = np.frombuffer(view[start:start + self._len_wave_array_1],
+                                dtype=type_identifier, count=self.count_wave_array)
 
             self.is_sequence = self.subarray_count > 1
             if self.is_sequence:
                 # Sequence Mode
                 start = self._pos_wavedesc + self._len_wavedesc + self._len_usertext
-                interleaved_data = np.frombuffer(
-                    self.data[start:start + self._len_triggertime_array],
-                    dtype=np.dtype((self.endianness + "f8", 2 * self.subarray_count)),
-                    count=1
-                )[0]
+                interleaved_data = np.frombuffer(view[start:start + self._len_triggertime_array],
+                                                 dtype=self.endianness + "f8", count=2 * self.subarray_count)
                 self.trigger_times = np.ascontiguousarray(interleaved_data[::2])
                 self.trigger_offsets = np.ascontiguousarray(interleaved_data[1::2])
 
                 points_per_subarray = int(self.count_wave_array / self.subarray_count)
 
-                self.y = self.y.reshape(self.subarray_count, points_per_subarray).T
-
-                self.x = np.tile(
-                    np.linspace(0, points_per_subarray * self.horizontal_interval, num=points_per_subarray),
-                    (self.subarray_count, 1)) + self.trigger_times.reshape((-1, 1)) + self.trigger_offsets.reshape(
-                    (-1, 1))
-                self.x = self.x.T
+                # one segment per row, so scaling and reductions run over contiguous memory
+                raw = raw.reshape(self.subarray_count, points_per_subarray)
 
-            # now scale the ADC values
-            self.y = self.vertical_gain * np.array(self.y) - self.vertical_offset
+            # extrema are taken on the raw ADC values, which is equivalent as the scaling is monotonic,
+            # but only has to read 1 or 2 bytes per sample. This pass over all samples stays in __init__,
+            # as the clipping warning is emitted while parsing.
+            y_max = self.vertical_gain * np.amax(raw, -1) - self.vertical_offset
+            y_min = self.vertical_gain * np.amin(raw, -1) - self.vertical_offset
 
             # If signal exceeds osci display grid: clipped_soft. If signal hits the maximum value limit: clipped_hard.
-            self.clipped_soft = np.logical_or(np.amax(self.y, 0) > self.y_max, np.amin(self.y, 0) < self.y_min)
+            self.clipped_soft = np.logical_or(y_max > self.y_max, y_min < self.y_min)
             # Experimental! Tested only with HDO4104
-            self.clipped_hard = np.logical_or(np.amax(self.y, 0) >= self.vertical_gain * (
+            self.clipped_hard = np.logical_or(y_max >= self.vertical_gain * (
                                                   32752 if self._comm_type == 1 else 127) - self.vertical_offset,
-                                              np.amin(self.y, 0) <= self.vertical_gain * (
+                                              y_min <= self.vertical_gain * (
                                                   -32768 if self._comm_type == 1 else -128) - self.vertical_offset)
             if np.any(self.clipped_hard):
                 warn(f'Signal was clipped: {self.source_desc}')
 
-            if sparse is not None:
-                indices = int(len(self.x) / sparse) * np.arange(sparse)
+            # x and y are only computed on first access, the clipping detection above still reads every sample
+            # immutable bytes can be referenced, other buffers are copied so later changes by the caller have no
+            # effect and the caller can still resize them
+            self._raw = raw if isinstance(data, bytes) else raw.copy()
+            self._samples = slice(None)
+            self._x = None
+            self._y = None
 
-                self.x = self.x[indices]
-                self.y = self.y[indices]
+            if sparse is not None:
+                # slicing with a step returns views instead of copies
+                stride = max(raw.shape[-1] // sparse, 1)
+                self._samples = slice(None, stride * sparse, stride)
 
-        except (ValueError, IndexError):
+        except (ValueError, IndexError, struct.error):
             raise DataCorruptException(f'Data corrupt: {self.source_desc}')
 
-    def _unpack(self, pos, format_specifier, length):
-        start = pos + self._pos_wavedesc
-        return np.frombuffer(self.data[start:start + length], self.endianness + format_specifier, count=1)[0]
-
-    def _parse_string(self, pos, length=16):
-        s = self._unpack(pos, "S{}".format(length), length)
-        if sys.version_info > (3, 0):
-            s = s.decode('ascii')
-        return s
-
-    def _parse_int16(self, pos):
-        return self._unpack(pos, "u2", 2)
-
-    def _parse_word(self, pos):
-        return self._unpack(pos, "i2", 2)
-
-    def _parse_int32(self, pos):
-        return self._unpack(pos, "i4", 4)
-
-    def _parse_float(self, pos):
-        return self._unpack(pos, "f4", 4)
+    @property
+    def x(self) -> np.ndarray:
+        """
+        Time of each sample, computed on first access.
 
-    def _parse_double(self, pos):
-        return self._unpack(pos, "f8", 8)
+        In sequence mode the samples are along axis 0 and the segments along axis 1.
+        """
+        if self._x is None:
+            # only generate the sample indices selected by sparse decoding
+            samples = range(self._raw.shape[-1])[self._samples]
+            x = np.arange(samples.start, samples.stop, samples.step, dtype=np.float64)
+            x *= self.horizontal_interval
+            if self.is_sequence:
+                x = x[:, None] + (self.trigger_times + self.trigger_offsets)[None, :]
+            else:
+                x += self.horizontal_offset
+            self._x = x
+        return self._x
+
+    @x.setter
+    def x(self, x: np.ndarray):
+        self._x = x
+
+    @property
+    def y(self) -> np.ndarray:
+        """
+        Scaled value of each sample, computed on first access.
 
-    def _parse_byte(self, pos):
-        return self._unpack(pos, "u1", 1)
+        In sequence mode the samples are along axis 0 and the segments along axis 1.
+        """
+        if self._y is None:
+            y = self._raw[..., self._samples].astype(np.float32)
+            y *= self.vertical_gain
+            y -= self.vertical_offset
+            # in sequence mode the segments are exposed as columns, matching x
+            self._y = y.T
+        return self._y
+
+    @y.setter
+    def y(self, y: np.ndarray):
+        self._y = y
 
-    def _parse_timestamp(self, pos):
-        second_float = self._parse_double(pos)
+    @staticmethod
+    def _parse_timestamp(header):
+        second_float = header['trigger_second']
         second = int(second_float)
         microsecond = int((second_float - second) * 1e6)
-        minute = self._parse_byte(pos + 8)
-        hour = self._parse_byte(pos + 9)
-        day = self._parse_byte(pos + 10)
-        month = self._parse_byte(pos + 11)
-        year = self._parse_word(pos + 12)
-
-        return datetime(year, month, day, hour, minute, second, microsecond)
 
-    def _parse_timebase(self, pos):
-        timebase = self._parse_int16(pos)
+        return datetime(header['trigger_year'], header['trigger_month'], header['trigger_day'],
+                        header['trigger_hour'], header['trigger_minute'], second, microsecond)
 
+    @staticmethod
+    def _parse_timebase(timebase):
         if timebase < 48:
             unit = "pnum k"[int(timebase / 9)]
-            value = [1, 2, 5, 10, 20, 50, 100, 200, 500][timebase % 9]
+            value = _SCALE_VALUES[timebase % 9]
             return "{} ".format(value) + unit.strip() + "s/div"
         elif timebase == 100:
             return "EXTERNAL"
 
-    def _parse_fixed_vert_gain(self, pos):
-        fixed_vert_gain = self._parse_int16(pos)
-
+    @staticmethod
+    def _parse_fixed_vert_gain(fixed_vert_gain):
         unit = "um k"[int(fixed_vert_gain / 9)]
-        value = [1, 2, 5, 10, 20, 50, 100, 200, 500][fixed_vert_gain % 9]
-        return "{} ".format(value) + unit.strip() + "V/div"
\ No newline at end of file
+        value = _SCALE_VALUES[fixed_vert_gain % 9]
+        return "{} ".format(value) + unit.strip() + "V/div"